@@ -4,48 +4,146 @@ Anonymize Jira API fixtures for safe version control
 This script takes raw fixtures and creates anonymized versions suitable for testing
 """
 
-import json
+import hashlib
+import math
 import os
-import re
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import orjson
+
+try:
+    import ijson
+except ImportError:  # Optional: only needed to stream large fixture dumps
+    ijson = None
+
+# Pretty-printed output; mapping keys may be non-string ids
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Environment variable holding the hash key; set it to keep output stable across runs
+SECRET_ENV_VAR = "JIRA_ANON_SECRET"
+
+# Files larger than this are stream-parsed (when ijson is installed) instead of loaded whole
+STREAM_THRESHOLD_BYTES = 16 * 1024 * 1024
+
+def _anonymize_url(value: str) -> str:
+    """Replace Adobe Jira URLs with example URLs"""
+    if 'adobe.com' not in value:
+        return value
+    return value.replace('https://jira.corp.adobe.com', 'https://jira.example.com').replace(
+        'https://jira.adobe.com', 'https://jira.example.com'
+    )
+
+@lru_cache(maxsize=65536)
+def _anon_number(value: str, secret: bytes) -> int:
+    """Keyed number for an original value; the same secret gives the same number
+    
+    The key stops anyone without the secret from matching outputs against
+    hashes of guessed names, and 8 bytes keeps identity collisions negligible.
+    Callers convert to str first so 1, True and 1.0 cannot share a cache entry.
+    """
+    digest = hashlib.blake2b(value.encode(), digest_size=8, key=secret).digest()
+    return int.from_bytes(digest, "big")
+
+def _anon_id(kind: str, value: Any, secret: bytes) -> str:
+    """Keyed anonymized identifier such as user1234567 for an original value"""
+    return f"{kind}{_anon_number(str(value), secret)}"
+
+# Keys whose presence marks a dict as a user, project or issue
+_USER_SIG = frozenset({"name", "displayName"})
+_PROJECT_SIG = frozenset({"key", "name", "projectTypeKey"})
+_ISSUE_SIG = frozenset({"key", "fields"})
+
+def _looks_like_entity(keys: Set[str]) -> bool:
+    """Check whether a dict with these keys is rewritten as a user, project or issue"""
+    return _USER_SIG <= keys or _PROJECT_SIG <= keys or _ISSUE_SIG <= keys
+
+def _secret_from_env() -> Optional[bytes]:
+    """Hash key derived from $JIRA_ANON_SECRET, or None when it is unset or empty"""
+    passphrase = os.environ.get(SECRET_ENV_VAR)
+    if not passphrase:
+        return None
+    # blake2b keys are at most 64 bytes, so derive a fixed-size key from any passphrase
+    return hashlib.blake2b(passphrase.encode(), digest_size=32).digest()
+
+def _orjson_number(value: Any) -> Any:
+    """Convert an ijson number (int or Decimal) to the value orjson.loads would produce"""
+    if isinstance(value, int) and -2**63 <= value < 2**64:
+        return value
+    number = float(value)
+    if math.isinf(number):
+        raise ValueError(f"number is infinity when parsed as double: {value}")
+    return number
+
+def _build_value(events: Iterator[Tuple[str, Any]], event: str, value: Any) -> Any:
+    """Build one complete JSON value from ijson events, starting at (event, value)"""
+    builder = ijson.ObjectBuilder()
+    builder.event(event, _orjson_number(value) if event == "number" else value)
+    if event not in ("start_map", "start_array"):
+        return builder.value
+    depth = 1
+    for event, value in events:
+        builder.event(event, _orjson_number(value) if event == "number" else value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                break
+    return builder.value
+
+def _dump_indented(data: Any, level: int) -> bytes:
+    """Serialize data as indented JSON, nested `level` steps deep"""
+    return orjson.dumps(data, option=JSON_OPTIONS).replace(b"\n", b"\n" + b"  " * level)
 
 class JiraFixtureAnonymizer:
-    def __init__(self):
-        self.anonymized_data = {
-            "users": {},
-            "projects": {},
-            "issues": {},
-            "emails": {},
-            "urls": {},
-            "ids": {},
-        }
+    __slots__ = ("users", "projects", "issues", "emails", "urls", "ids", "secret")
+    
+    # Anonymization maps included in the mapping dump
+    MAP_KINDS = ("users", "projects", "issues", "emails", "urls", "ids")
+    
+    def __init__(self, secret: Optional[bytes] = None):
+        # Hash key; share it between anonymizers whose output must agree (random if not given)
+        self.secret = secret if secret is not None else secrets.token_bytes(32)
+        self.users: Dict[str, str] = {}
+        self.projects: Dict[str, str] = {}
+        self.issues: Dict[str, str] = {}
+        self.emails: Dict[str, str] = {}
+        self.urls: Dict[str, str] = {}
+        self.ids: Dict[Any, str] = {}
+    
+    @property
+    def anonymized_data(self) -> Dict[str, Dict[Any, str]]:
+        """All anonymization maps keyed by kind, assembled for the mapping dump"""
+        return {kind: getattr(self, kind) for kind in self.MAP_KINDS}
         
     def anonymize_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Anonymize user data"""
+        """Anonymize user data in place"""
         if not isinstance(user_data, dict):
             return user_data
             
-        anonymized = user_data.copy()
+        # Mutate in place; callers only use the returned value
+        anonymized = user_data
         
         # Anonymize user identifiers
         if "name" in anonymized:
             original_name = anonymized["name"]
-            if original_name not in self.anonymized_data["users"]:
-                self.anonymized_data["users"][original_name] = f"user{len(self.anonymized_data['users']) + 1}"
-            anonymized["name"] = self.anonymized_data["users"][original_name]
+            anonymized["name"] = self.users[original_name] = _anon_id("user", original_name, self.secret)
             
         if "key" in anonymized:
             anonymized["key"] = anonymized.get("name", "user1")
             
         if "displayName" in anonymized:
-            anonymized["displayName"] = f"Test User {len(self.anonymized_data['users'])}"
+            anonymized["displayName"] = f"Test User {_anon_number(str(anonymized['displayName']), self.secret)}"
             
         if "emailAddress" in anonymized:
             original_email = anonymized["emailAddress"]
-            if original_email not in self.anonymized_data["emails"]:
-                self.anonymized_data["emails"][original_email] = f"testuser{len(self.anonymized_data['emails']) + 1}@example.com"
-            anonymized["emailAddress"] = self.anonymized_data["emails"][original_email]
+            anonymized["emailAddress"] = self.emails[original_email] = (
+                f"{_anon_id('testuser', original_email, self.secret)}@example.com"
+            )
             
         # Anonymize avatar URLs
         if "avatarUrls" in anonymized and isinstance(anonymized["avatarUrls"], dict):
@@ -55,27 +153,24 @@ class JiraFixtureAnonymizer:
         return anonymized
     
     def anonymize_project(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Anonymize project data"""
+        """Anonymize project data in place"""
         if not isinstance(project_data, dict):
             return project_data
             
-        anonymized = project_data.copy()
+        # Mutate in place; callers only use the returned value
+        anonymized = project_data
         
         # Anonymize project identifiers
         if "key" in anonymized:
             original_key = anonymized["key"]
-            if original_key not in self.anonymized_data["projects"]:
-                self.anonymized_data["projects"][original_key] = f"TEST{len(self.anonymized_data['projects']) + 1}"
-            anonymized["key"] = self.anonymized_data["projects"][original_key]
+            anonymized["key"] = self.projects[original_key] = _anon_id("TEST", original_key, self.secret)
             
         if "name" in anonymized:
-            anonymized["name"] = f"Test Project {len(self.anonymized_data['projects'])}"
+            anonymized["name"] = f"Test Project {_anon_number(str(anonymized['name']), self.secret)}"
             
         if "id" in anonymized:
             original_id = anonymized["id"]
-            if original_id not in self.anonymized_data["ids"]:
-                self.anonymized_data["ids"][original_id] = str(10000 + len(self.anonymized_data["ids"]))
-            anonymized["id"] = self.anonymized_data["ids"][original_id]
+            anonymized["id"] = self.ids[original_id] = str(_anon_number(str(original_id), self.secret))
             
         # Anonymize avatar URLs
         if "avatarUrls" in anonymized and isinstance(anonymized["avatarUrls"], dict):
@@ -85,27 +180,25 @@ class JiraFixtureAnonymizer:
         return anonymized
     
     def anonymize_issue(self, issue_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Anonymize issue data"""
+        """Anonymize issue data in place"""
         if not isinstance(issue_data, dict):
             return issue_data
             
-        anonymized = issue_data.copy()
+        # Mutate in place; callers only use the returned value
+        anonymized = issue_data
         
         # Anonymize issue key
         if "key" in anonymized:
             original_key = anonymized["key"]
-            if original_key not in self.anonymized_data["issues"]:
-                project_key = original_key.split("-")[0] if "-" in original_key else "TEST"
-                issue_num = len(self.anonymized_data["issues"]) + 1
-                self.anonymized_data["issues"][original_key] = f"{project_key}-{issue_num}"
-            anonymized["key"] = self.anonymized_data["issues"][original_key]
+            project_key = original_key.split("-")[0] if "-" in original_key else "TEST"
+            anonymized["key"] = self.issues[original_key] = (
+                f"{project_key}-{_anon_number(str(original_key), self.secret)}"
+            )
             
         # Anonymize issue ID
         if "id" in anonymized:
             original_id = anonymized["id"]
-            if original_id not in self.anonymized_data["ids"]:
-                self.anonymized_data["ids"][original_id] = str(20000 + len(self.anonymized_data["ids"]))
-            anonymized["id"] = self.anonymized_data["ids"][original_id]
+            anonymized["id"] = self.ids[original_id] = str(_anon_number(str(original_id), self.secret))
             
         # Anonymize fields
         if "fields" in anonymized and isinstance(anonymized["fields"], dict):
@@ -113,7 +206,7 @@ class JiraFixtureAnonymizer:
             
             # Anonymize summary and description
             if "summary" in fields:
-                fields["summary"] = f"Test Issue Summary {len(self.anonymized_data['issues'])}"
+                fields["summary"] = f"Test Issue Summary {_anon_number(str(fields['summary']), self.secret)}"
             if "description" in fields:
                 fields["description"] = f"Test issue description for {anonymized.get('key', 'TEST-1')}"
                 
@@ -132,19 +225,14 @@ class JiraFixtureAnonymizer:
                     field_data = fields[field_name]
                     if "id" in field_data:
                         original_id = field_data["id"]
-                        if original_id not in self.anonymized_data["ids"]:
-                            self.anonymized_data["ids"][original_id] = str(30000 + len(self.anonymized_data["ids"]))
-                        field_data["id"] = self.anonymized_data["ids"][original_id]
+                        field_data["id"] = self.ids[original_id] = str(_anon_number(str(original_id), self.secret))
                         
         return anonymized
     
     def anonymize_urls(self, data: Any) -> Any:
         """Anonymize URLs in data"""
         if isinstance(data, str):
-            # Replace Adobe Jira URLs with example URLs
-            data = re.sub(r'https://jira\.corp\.adobe\.com', 'https://jira.example.com', data)
-            data = re.sub(r'https://jira\.adobe\.com', 'https://jira.example.com', data)
-            return data
+            return _anonymize_url(data)
         elif isinstance(data, dict):
             return {k: self.anonymize_urls(v) for k, v in data.items()}
         elif isinstance(data, list):
@@ -152,77 +240,171 @@ class JiraFixtureAnonymizer:
         else:
             return data
     
+    # Checked in order: a dict matching both the user and project signatures is a user
+    _ENTITY_HANDLERS = (
+        (_USER_SIG, anonymize_user),
+        (_PROJECT_SIG, anonymize_project),
+        (_ISSUE_SIG, anonymize_issue),
+    )
+    
     def anonymize_data(self, data: Any) -> Any:
-        """Recursively anonymize all data"""
-        if isinstance(data, dict):
-            # Check if this looks like user data
-            if "name" in data and "displayName" in data:
-                data = self.anonymize_user(data)
-            elif "key" in data and "name" in data and "projectTypeKey" in data:
-                data = self.anonymize_project(data)
-            elif "key" in data and "fields" in data:
-                data = self.anonymize_issue(data)
-            else:
-                # Recursively anonymize nested data
-                data = {k: self.anonymize_data(v) for k, v in data.items()}
+        """Recursively anonymize all data in a single traversal"""
+        if isinstance(data, str):
+            return _anonymize_url(data)
+        elif isinstance(data, dict):
+            # Check if this looks like user, project or issue data
+            keys = data.keys()
+            for signature, anonymize in self._ENTITY_HANDLERS:
+                if signature <= keys:
+                    return self.anonymize_urls(anonymize(self, data))
+            # Recursively anonymize nested data, rewriting string values inline
+            return {
+                k: _anonymize_url(v) if isinstance(v, str) else self.anonymize_data(v)
+                for k, v in data.items()
+            }
         elif isinstance(data, list):
-            data = [self.anonymize_data(item) for item in data]
-        
-        # Anonymize URLs
-        data = self.anonymize_urls(data)
-        
+            return [
+                _anonymize_url(item) if isinstance(item, str) else self.anonymize_data(item)
+                for item in data
+            ]
         return data
     
-    def process_file(self, input_path: Path, output_path: Path) -> None:
-        """Process a single fixture file"""
+    def process_file(self, input_path: Path, output_path: Path) -> Dict[str, Dict[str, Any]]:
+        """Process a single fixture file and return the anonymization mapping"""
         print(f"Processing {input_path} -> {output_path}")
         
         try:
-            with open(input_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Ensure output directory exists
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            if ijson is not None and input_path.stat().st_size > STREAM_THRESHOLD_BYTES:
+                self.process_file_streaming(input_path, output_path)
+                return self.anonymized_data
+            
+            data = orjson.loads(input_path.read_bytes())
             
             # Anonymize the data
             anonymized_data = self.anonymize_data(data)
             
-            # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
             # Write anonymized data
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(anonymized_data, f, indent=2, ensure_ascii=False)
+            output_path.write_bytes(orjson.dumps(anonymized_data, option=JSON_OPTIONS))
                 
         except Exception as e:
             print(f"Error processing {input_path}: {e}")
+        
+        return self.anonymized_data
     
-    def process_directory(self, input_dir: Path, output_dir: Path) -> None:
-        """Process all JSON files in a directory"""
+    def process_file_streaming(self, input_path: Path, output_path: Path) -> None:
+        """Process a large fixture file without loading it whole
+        
+        The top-level container and any arrays nested directly in streamed
+        containers are written one element at a time; every other value is
+        built and anonymized as a unit, so memory is bounded by the largest
+        such value rather than the file size. The file is parsed once, unless
+        its top level turns out to be a single user, project or issue; that
+        needs the complete dict, so the file is then re-read and loaded whole.
+        """
+        # Stream into a scratch anonymizer so an abandoned pass leaves no mapping entries
+        scratch = JiraFixtureAnonymizer(self.secret)
+        top_keys: Set[str] = set()
+        # Write next to the output and move it into place only once the whole file parsed
+        partial_path = output_path.with_name(output_path.name + ".partial")
+        try:
+            with open(input_path, 'rb') as src, open(partial_path, 'wb') as out:
+                # Without use_float, numbers outside the C backend's int64/double range still parse
+                events = ijson.basic_parse(src)
+                event, value = next(events)
+                scratch._stream_value(events, event, value, out, 0, top_keys)
+                # Reject trailing data after the top-level value, as orjson.loads does
+                if next(events, None) is not None:
+                    raise ValueError("unexpected data after the top-level JSON value")
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
+        
+        if _looks_like_entity(top_keys):
+            partial_path.unlink()
+            data = self.anonymize_data(orjson.loads(input_path.read_bytes()))
+            output_path.write_bytes(orjson.dumps(data, option=JSON_OPTIONS))
+            return
+        
+        os.replace(partial_path, output_path)
+        for kind in self.MAP_KINDS:
+            getattr(self, kind).update(getattr(scratch, kind))
+    
+    def _stream_value(
+        self, events: Iterator[Tuple[str, Any]], event: str, value: Any, out, level: int, top_keys: Set[str]
+    ) -> None:
+        """Anonymize and write one value whose parent container is being streamed
+        
+        Keys of the top-level object are collected into top_keys as they stream past.
+        """
+        if not (event == "start_array" or (event == "start_map" and level == 0)):
+            out.write(_dump_indented(self.anonymize_data(_build_value(events, event, value)), level))
+            return
+        
+        is_map = event == "start_map"
+        end_event = "end_map" if is_map else "end_array"
+        out.write(b"{" if is_map else b"[")
+        first = True
+        for event, value in events:
+            if event == end_event:
+                break
+            out.write((b"\n" if first else b",\n") + b"  " * (level + 1))
+            first = False
+            if is_map:
+                top_keys.add(value)
+                out.write(orjson.dumps(value) + b": ")
+                event, value = next(events)
+            self._stream_value(events, event, value, out, level + 1, top_keys)
+        if not first:
+            out.write(b"\n" + b"  " * level)
+        out.write(b"}" if is_map else b"]")
+    
+    def process_directory(self, input_dir: Path, output_dir: Path, max_workers: Optional[int] = None) -> None:
+        """Process all JSON files in a directory
+        
+        Files are anonymized in parallel worker processes, each with its own
+        anonymizer. Anonymized values are a hash of the original keyed with
+        this anonymizer's secret, so they agree across files; the per-file
+        mappings are merged into this anonymizer's mapping.
+        """
         if not input_dir.exists():
             print(f"Input directory {input_dir} does not exist")
             return
             
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        for json_file in input_dir.glob("*.json"):
-            if json_file.name.startswith("."):
-                continue
-                
-            output_file = output_dir / json_file.name
-            self.process_file(json_file, output_file)
+        json_files = sorted(f for f in input_dir.glob("*.json") if not f.name.startswith("."))
+        output_files = [output_dir / f.name for f in json_files]
+        worker_secrets = [self.secret] * len(json_files)
         
-        print(f"Processed {len(list(input_dir.glob('*.json')))} files")
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            for mapping in executor.map(_process_file_worker, json_files, output_files, worker_secrets):
+                for kind, values in mapping.items():
+                    getattr(self, kind).update(values)
+        
+        print(f"Processed {len(json_files)} files")
+
+def _process_file_worker(input_path: Path, output_path: Path, secret: bytes) -> Dict[str, Dict[str, Any]]:
+    """Anonymize one file with a fresh anonymizer sharing the run's secret; runs in a worker process"""
+    return JiraFixtureAnonymizer(secret).process_file(input_path, output_path)
 
 def main():
     """Main function"""
     input_dir = Path("fixtures/raw")
     output_dir = Path("fixtures/anonymized")
     
-    anonymizer = JiraFixtureAnonymizer()
+    # A fixed secret keeps anonymized output identical between runs
+    secret = _secret_from_env()
+    if secret is None:
+        print(f"{SECRET_ENV_VAR} is not set; using a random key, so anonymized values change every run")
+    anonymizer = JiraFixtureAnonymizer(secret)
     anonymizer.process_directory(input_dir, output_dir)
     
     # Save anonymization mapping for reference
     mapping_file = output_dir / "anonymization_mapping.json"
-    with open(mapping_file, 'w', encoding='utf-8') as f:
-        json.dump(anonymizer.anonymized_data, f, indent=2, ensure_ascii=False)
+    mapping_file.write_bytes(orjson.dumps(anonymizer.anonymized_data, option=JSON_OPTIONS))
     
     print(f"Anonymization complete! Output saved to {output_dir}")
     print(f"Anonymization mapping saved to {mapping_file}")
@@ -4,14 +4,169 @@ Mock data generator for Jira MCP tests.
 Creates realistic test data without hitting the live API.
 """
 
-import json
 import random
+from collections import namedtuple
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, cast
 
-def generate_mock_user() -> Dict[str, Any]:
+import numpy as np
+
+import orjson
+
+# Pretty-printed output for the generated fixture files
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Default rng: the random module's functions are bound methods of its shared
+# generator, so drawing through the module keeps random.seed() reproducible
+_GLOBAL_RNG = cast(random.Random, random)
+
+# Read-only fragments shared by every generated issue and project; copied on use
+_BUG_ISSUETYPE = MappingProxyType({
+    "self": "https://jira.corp.adobe.com/rest/api/2/issuetype/1",
+    "id": "1",
+    "description": "A problem which impairs or prevents the functions of the product.",
+    "iconUrl": "https://jira.corp.adobe.com/secure/viewavatar?size=xsmall&avatarId=18803&avatarType=issuetype",
+    "name": "Bug",
+    "subtask": False,
+    "avatarId": 18803
+})
+
+_STORY_ISSUETYPE = MappingProxyType({
+    "self": "https://jira.corp.adobe.com/rest/api/2/issuetype/7",
+    "id": "7",
+    "description": "Created by Jira Software - do not edit or delete. Issue type for a user story.",
+    "iconUrl": "https://jira.corp.adobe.com/secure/viewavatar?size=xsmall&avatarId=18815&avatarType=issuetype",
+    "name": "Story",
+    "subtask": False,
+    "avatarId": 18815
+})
+
+_ISSUE_PRIORITY = MappingProxyType({
+    "self": "https://jira.corp.adobe.com/rest/api/2/priority/8",
+    "iconUrl": "https://jira.corp.adobe.com/images/icons/priorities/normal.png",
+    "name": None,
+    "id": "8"
+})
+
+_ISSUE_STATUS = MappingProxyType({
+    "self": "https://jira.corp.adobe.com/rest/api/2/status/10019",
+    "description": "The issue is open and ready for the assignee to start work on it.",
+    "iconUrl": "https://jira.corp.adobe.com/images/icons/statuses/visible.png",
+    "name": None,
+    "id": "10019",
+    "statusCategory": None
+})
+
+_TODO_STATUS_CATEGORY = MappingProxyType({
+    "self": "https://jira.corp.adobe.com/rest/api/2/statuscategory/2",
+    "id": 2,
+    "key": "new",
+    "colorName": "default",
+    "name": "To Do"
+})
+
+# Categorical values drawn for each mock issue
+_STATUSES = ("Backlog", "In Progress", "Done", "To Do", "In Review")
+_PRIORITIES = ("Low", "Normal", "High", "Critical")
+_ISSUE_TYPES = ("Story", "Bug", "Task", "Epic")
+
+_ISSUE_CHOICES = {
+    "issue_type": _ISSUE_TYPES,
+    "priority": _PRIORITIES,
+    "status": _STATUSES,
+}
+
+# Inclusive (low, high) ranges of the integer values drawn for each mock issue
+_ISSUE_INT_RANGES = {
+    "issue_number": (1000, 9999),
+    "created_days": (1, 365),
+    "updated_days": (0, 30),
+    "id": (10000000, 99999999),
+    "self_id": (10000000, 99999999),
+    "project_self_id": (10000, 99999),
+    "project_id": (10000, 99999),
+    "avatar_pid_48": (10000, 99999),
+    "avatar_pid_24": (10000, 99999),
+    "avatar_pid_16": (10000, 99999),
+    "avatar_pid_32": (10000, 99999),
+    "num_labels": (0, 3),
+    "watch_count": (0, 5),
+    "votes": (0, 10),
+    "worklog_total": (0, 5),
+    "comment_total": (0, 3),
+    "progress": (0, 100),
+    "aggregate_progress": (0, 100),
+    "timeestimate": (0, 40),
+    "timeoriginalestimate": (0, 40),
+    "timespent": (0, 20),
+    "aggregatetimeestimate": (0, 40),
+    "aggregatetimespent": (0, 20),
+    "workratio": (-1, 100),
+}
+
+# Optional issue values are present when a uniform draw exceeds the threshold
+_ISSUE_FLAG_THRESHOLDS = {
+    "has_assignee": 0.3,
+    "has_timeestimate": 0.5,
+    "has_timeoriginalestimate": 0.5,
+    "has_timespent": 0.5,
+    "has_aggregatetimeestimate": 0.5,
+    "has_aggregatetimespent": 0.5,
+}
+
+# Every drawn value of one mock issue, in the order of the tables above
+_IssueRandoms = namedtuple("_IssueRandoms", (*_ISSUE_INT_RANGES, *_ISSUE_FLAG_THRESHOLDS, *_ISSUE_CHOICES))
+
+_ISSUE_INT_LOWS = np.array([low for low, _ in _ISSUE_INT_RANGES.values()], dtype=np.int64)
+_ISSUE_INT_HIGHS = np.array([high for _, high in _ISSUE_INT_RANGES.values()], dtype=np.int64)
+_ISSUE_FLAG_CUTOFFS = np.array(list(_ISSUE_FLAG_THRESHOLDS.values()))
+
+# (low, count) of each integer range; low + int(random() * count) is the index draw
+# random.choices uses, and several times cheaper than randint
+_ISSUE_INT_COUNTS = tuple((low, high - low + 1) for low, high in _ISSUE_INT_RANGES.values())
+
+# Smaller batches are drawn per issue; creating a NumPy generator costs more than it saves
+_NUMPY_MIN_ISSUES = 8
+
+def _draw_issue_row(rng: random.Random) -> _IssueRandoms:
+    """Draw the random values for one mock issue with plain rng calls."""
+    return _IssueRandoms(
+        *[low + int(rng.random() * count) for low, count in _ISSUE_INT_COUNTS],
+        *[rng.random() > threshold for threshold in _ISSUE_FLAG_THRESHOLDS.values()],
+        *[rng.choice(options) for options in _ISSUE_CHOICES.values()],
+    )
+
+def _draw_issue_randoms(num_issues: int, rng: random.Random) -> List[_IssueRandoms]:
+    """Draw the random values for num_issues mock issues.
+
+    Large batches come from one NumPy draw per value kind, seeded from rng,
+    so a seeded random.Random reproduces the batch either way.
+    """
+    if num_issues < _NUMPY_MIN_ISSUES:
+        return [_draw_issue_row(rng) for _ in range(num_issues)]
+    
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    scalars = np_rng.integers(
+        _ISSUE_INT_LOWS[:, None], _ISSUE_INT_HIGHS[:, None] + 1, size=(len(_ISSUE_INT_RANGES), num_issues)
+    )
+    flags = np_rng.random((len(_ISSUE_FLAG_THRESHOLDS), num_issues)) > _ISSUE_FLAG_CUTOFFS[:, None]
+    columns = [
+        *scalars.tolist(),
+        *flags.tolist(),
+        *[rng.choices(options, k=num_issues) for options in _ISSUE_CHOICES.values()],
+    ]
+    return list(map(_IssueRandoms._make, zip(*columns)))
+
+def _dumps_text(data: Any) -> str:
+    """Serialize data as compact JSON text (MCPContent.text is a string)."""
+    return orjson.dumps(data).decode()
+
+def generate_mock_user(rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """Generate a mock Jira user."""
-    user_id = f"test_user_{random.randint(1000, 9999)}"
+    if rng is None:
+        rng = _GLOBAL_RNG
+    user_id = f"test_user_{rng.randint(1000, 9999)}"
     return {
         "self": f"https://jira.corp.adobe.com/rest/api/2/user?username={user_id}",
         "name": user_id,
@@ -23,76 +178,58 @@ def generate_mock_user() -> Dict[str, Any]:
             "16x16": f"https://jira.corp.adobe.com/secure/useravatar?size=xsmall&ownerId={user_id}&avatarId=12345",
             "32x32": f"https://jira.corp.adobe.com/secure/useravatar?size=medium&ownerId={user_id}&avatarId=12345"
         },
-        "displayName": f"Test User {random.randint(1, 100)}",
+        "displayName": f"Test User {rng.randint(1, 100)}",
         "active": True,
         "timeZone": "America/Los_Angeles"
     }
 
-def generate_mock_issue(issue_key: str, project_key: str = "DNA") -> Dict[str, Any]:
-    """Generate a mock Jira issue."""
-    statuses = ["Backlog", "In Progress", "Done", "To Do", "In Review"]
-    priorities = ["Low", "Normal", "High", "Critical"]
-    issue_types = ["Story", "Bug", "Task", "Epic"]
-    
-    created_date = datetime.now() - timedelta(days=random.randint(1, 365))
-    updated_date = created_date + timedelta(days=random.randint(0, 30))
+def generate_mock_issue(
+    issue_key: str,
+    project_key: str = "DNA",
+    rands: Optional[_IssueRandoms] = None,
+    *,
+    now: Optional[datetime] = None,
+    rng: Optional[random.Random] = None,
+) -> Dict[str, Any]:
+    """Generate a mock Jira issue from pre-drawn random values (drawn here if not given)."""
+    if rng is None:
+        rng = _GLOBAL_RNG
+    r = rands if rands is not None else _draw_issue_row(rng)
+    if now is None:
+        now = datetime.now()
+    created_date = now - timedelta(days=r.created_days)
+    updated_date = created_date + timedelta(days=r.updated_days)
     
     return {
         "expand": "renderedFields,names,schema,operations,editmeta,changelog,versionedRepresentations",
-        "id": str(random.randint(10000000, 99999999)),
-        "self": f"https://jira.corp.adobe.com/rest/api/2/issue/{random.randint(10000000, 99999999)}",
+        "id": str(r.id),
+        "self": f"https://jira.corp.adobe.com/rest/api/2/issue/{r.self_id}",
         "key": issue_key,
         "fields": {
-            "summary": f"Test {issue_types[random.randint(0, len(issue_types)-1)]} for {project_key} project",
+            "summary": f"Test {r.issue_type} for {project_key} project",
             "description": f"This is a test issue for the {project_key} project. It contains mock data for testing purposes.",
-            "issuetype": {
-                "self": "https://jira.corp.adobe.com/rest/api/2/issuetype/7",
-                "id": "7",
-                "description": "Created by Jira Software - do not edit or delete. Issue type for a user story.",
-                "iconUrl": "https://jira.corp.adobe.com/secure/viewavatar?size=xsmall&avatarId=18815&avatarType=issuetype",
-                "name": issue_types[random.randint(0, len(issue_types)-1)],
-                "subtask": False,
-                "avatarId": 18815
-            },
+            "issuetype": _STORY_ISSUETYPE | {"name": r.issue_type},
             "project": {
-                "self": f"https://jira.corp.adobe.com/rest/api/2/project/{random.randint(10000, 99999)}",
-                "id": str(random.randint(10000, 99999)),
+                "self": f"https://jira.corp.adobe.com/rest/api/2/project/{r.project_self_id}",
+                "id": str(r.project_id),
                 "key": project_key,
                 "name": f"Test {project_key} Project",
                 "projectTypeKey": "software",
                 "avatarUrls": {
-                    "48x48": f"https://jira.corp.adobe.com/secure/projectavatar?pid={random.randint(10000, 99999)}&avatarId=147103",
-                    "24x24": f"https://jira.corp.adobe.com/secure/projectavatar?size=small&pid={random.randint(10000, 99999)}&avatarId=147103",
-                    "16x16": f"https://jira.corp.adobe.com/secure/projectavatar?size=xsmall&pid={random.randint(10000, 99999)}&avatarId=147103",
-                    "32x32": f"https://jira.corp.adobe.com/secure/projectavatar?size=medium&pid={random.randint(10000, 99999)}&avatarId=147103"
-                }
-            },
-            "priority": {
-                "self": "https://jira.corp.adobe.com/rest/api/2/priority/8",
-                "iconUrl": "https://jira.corp.adobe.com/images/icons/priorities/normal.png",
-                "name": priorities[random.randint(0, len(priorities)-1)],
-                "id": "8"
-            },
-            "status": {
-                "self": "https://jira.corp.adobe.com/rest/api/2/status/10019",
-                "description": "The issue is open and ready for the assignee to start work on it.",
-                "iconUrl": "https://jira.corp.adobe.com/images/icons/statuses/visible.png",
-                "name": statuses[random.randint(0, len(statuses)-1)],
-                "id": "10019",
-                "statusCategory": {
-                    "self": "https://jira.corp.adobe.com/rest/api/2/statuscategory/2",
-                    "id": 2,
-                    "key": "new",
-                    "colorName": "default",
-                    "name": "To Do"
+                    "48x48": f"https://jira.corp.adobe.com/secure/projectavatar?pid={r.avatar_pid_48}&avatarId=147103",
+                    "24x24": f"https://jira.corp.adobe.com/secure/projectavatar?size=small&pid={r.avatar_pid_24}&avatarId=147103",
+                    "16x16": f"https://jira.corp.adobe.com/secure/projectavatar?size=xsmall&pid={r.avatar_pid_16}&avatarId=147103",
+                    "32x32": f"https://jira.corp.adobe.com/secure/projectavatar?size=medium&pid={r.avatar_pid_32}&avatarId=147103"
                 }
             },
-            "assignee": generate_mock_user() if random.random() > 0.3 else None,
-            "reporter": generate_mock_user(),
-            "creator": generate_mock_user(),
+            "priority": _ISSUE_PRIORITY | {"name": r.priority},
+            "status": _ISSUE_STATUS | {"name": r.status, "statusCategory": _TODO_STATUS_CATEGORY.copy()},
+            "assignee": generate_mock_user(rng) if r.has_assignee else None,
+            "reporter": generate_mock_user(rng),
+            "creator": generate_mock_user(rng),
             "created": created_date.isoformat() + "+0000",
             "updated": updated_date.isoformat() + "+0000",
-            "labels": [f"test-label-{i}" for i in range(random.randint(0, 3))],
+            "labels": [f"test-label-{i}" for i in range(r.num_labels)],
             "components": [],
             "fixVersions": [],
             "versions": [],
@@ -100,40 +237,40 @@ def generate_mock_issue(issue_key: str, project_key: str = "DNA") -> Dict[str, A
             "subtasks": [],
             "watches": {
                 "self": f"https://jira.corp.adobe.com/rest/api/2/issue/{issue_key}/watchers",
-                "watchCount": random.randint(0, 5),
+                "watchCount": r.watch_count,
                 "isWatching": False
             },
             "votes": {
                 "self": f"https://jira.corp.adobe.com/rest/api/2/issue/{issue_key}/votes",
-                "votes": random.randint(0, 10),
+                "votes": r.votes,
                 "hasVoted": False
             },
             "worklog": {
                 "startAt": 0,
                 "maxResults": 20,
-                "total": random.randint(0, 5),
+                "total": r.worklog_total,
                 "worklogs": []
             },
             "comment": {
                 "comments": [],
                 "maxResults": 0,
-                "total": random.randint(0, 3),
+                "total": r.comment_total,
                 "startAt": 0
             },
             "progress": {
-                "progress": random.randint(0, 100),
+                "progress": r.progress,
                 "total": 100
             },
             "aggregateprogress": {
-                "progress": random.randint(0, 100),
+                "progress": r.aggregate_progress,
                 "total": 100
             },
-            "timeestimate": random.randint(0, 40) * 3600 if random.random() > 0.5 else None,
-            "timeoriginalestimate": random.randint(0, 40) * 3600 if random.random() > 0.5 else None,
-            "timespent": random.randint(0, 20) * 3600 if random.random() > 0.5 else None,
-            "aggregatetimeestimate": random.randint(0, 40) * 3600 if random.random() > 0.5 else None,
-            "aggregatetimespent": random.randint(0, 20) * 3600 if random.random() > 0.5 else None,
-            "workratio": random.randint(-1, 100),
+            "timeestimate": r.timeestimate * 3600 if r.has_timeestimate else None,
+            "timeoriginalestimate": r.timeoriginalestimate * 3600 if r.has_timeoriginalestimate else None,
+            "timespent": r.timespent * 3600 if r.has_timespent else None,
+            "aggregatetimeestimate": r.aggregatetimeestimate * 3600 if r.has_aggregatetimeestimate else None,
+            "aggregatetimespent": r.aggregatetimespent * 3600 if r.has_aggregatetimespent else None,
+            "workratio": r.workratio,
             "resolution": None,
             "resolutiondate": None,
             "duedate": None,
@@ -142,24 +279,29 @@ def generate_mock_issue(issue_key: str, project_key: str = "DNA") -> Dict[str, A
             "issuelinks": [],
             "votes": {
                 "self": f"https://jira.corp.adobe.com/rest/api/2/issue/{issue_key}/votes",
-                "votes": random.randint(0, 10),
+                "votes": r.votes,
                 "hasVoted": False
             }
         }
     }
 
-def generate_mock_search_result(project_key: str = "DNA", num_issues: int = 5) -> Dict[str, Any]:
-    """Generate a mock search result."""
-    issues = []
-    for i in range(num_issues):
-        issue_key = f"{project_key}-{random.randint(1000, 9999)}"
-        issues.append(generate_mock_issue(issue_key, project_key))
+def generate_mock_search_result(project_key: str = "DNA", num_issues: int = 5, seed: Optional[int] = None) -> Dict[str, Any]:
+    """Generate a mock search result; pass a seed for reproducible issues.
+
+    Without a seed, values come from the global random stream, so random.seed() applies.
+    """
+    rng = _GLOBAL_RNG if seed is None else random.Random(seed)
+    now = datetime.now()
+    issues = [
+        generate_mock_issue(f"{project_key}-{rands.issue_number}", project_key, rands, now=now, rng=rng)
+        for rands in _draw_issue_randoms(num_issues, rng)
+    ]
     
     return {
         "expand": "schema,names",
         "startAt": 0,
         "maxResults": num_issues,
-        "total": random.randint(num_issues, num_issues * 10),
+        "total": rng.randint(num_issues, num_issues * 10),
         "issues": issues
     }
 
@@ -181,26 +323,7 @@ def generate_mock_project(project_key: str = "DNA") -> Dict[str, Any]:
             }
             for i in range(random.randint(2, 5))
         ],
-        "issueTypes": [
-            {
-                "self": "https://jira.corp.adobe.com/rest/api/2/issuetype/1",
-                "id": "1",
-                "description": "A problem which impairs or prevents the functions of the product.",
-                "iconUrl": "https://jira.corp.adobe.com/secure/viewavatar?size=xsmall&avatarId=18803&avatarType=issuetype",
-                "name": "Bug",
-                "subtask": False,
-                "avatarId": 18803
-            },
-            {
-                "self": "https://jira.corp.adobe.com/rest/api/2/issuetype/7",
-                "id": "7",
-                "description": "Created by Jira Software - do not edit or delete. Issue type for a user story.",
-                "iconUrl": "https://jira.corp.adobe.com/secure/viewavatar?size=xsmall&avatarId=18815&avatarType=issuetype",
-                "name": "Story",
-                "subtask": False,
-                "avatarId": 18815
-            }
-        ],
+        "issueTypes": [dict(_BUG_ISSUETYPE), dict(_STORY_ISSUETYPE)],
         "url": f"https://test-{project_key.lower()}.corp.adobe.com",
         "assigneeType": "UNASSIGNED",
         "versions": [],
@@ -238,7 +361,7 @@ def generate_mock_test_data() -> Dict[str, Any]:
                 "result": {
                     "content": [
                         {
-                            "text": json.dumps(generate_mock_project("DNA"), indent=2),
+                            "text": _dumps_text(generate_mock_project("DNA")),
                             "type": "text"
                         }
                     ],
@@ -251,7 +374,7 @@ def generate_mock_test_data() -> Dict[str, Any]:
                 "result": {
                     "content": [
                         {
-                            "text": json.dumps(generate_mock_issue("DNA-1244", "DNA"), indent=2),
+                            "text": _dumps_text(generate_mock_issue("DNA-1244", "DNA")),
                             "type": "text"
                         }
                     ],
@@ -264,7 +387,7 @@ def generate_mock_test_data() -> Dict[str, Any]:
                 "result": {
                     "content": [
                         {
-                            "text": json.dumps(generate_mock_search_result("DNA", 5), indent=2),
+                            "text": _dumps_text(generate_mock_search_result("DNA", 5)),
                             "type": "text"
                         }
                     ],
@@ -277,7 +400,7 @@ def generate_mock_test_data() -> Dict[str, Any]:
                 "result": {
                     "content": [
                         {
-                            "text": json.dumps([
+                            "text": _dumps_text([
                                 {
                                     "self": f"https://jira.corp.adobe.com/rest/api/2/component/{random.randint(100000, 999999)}",
                                     "id": str(random.randint(100000, 999999)),
@@ -285,7 +408,7 @@ def generate_mock_test_data() -> Dict[str, Any]:
                                     "isAssigneeTypeValid": False
                                 }
                                 for i in range(random.randint(2, 5))
-                            ], indent=2),
+                            ]),
                             "type": "text"
                         }
                     ],
@@ -298,26 +421,7 @@ def generate_mock_test_data() -> Dict[str, Any]:
                 "result": {
                     "content": [
                         {
-                            "text": json.dumps([
-                                {
-                                    "self": "https://jira.corp.adobe.com/rest/api/2/issuetype/1",
-                                    "id": "1",
-                                    "description": "A problem which impairs or prevents the functions of the product.",
-                                    "iconUrl": "https://jira.corp.adobe.com/secure/viewavatar?size=xsmall&avatarId=18803&avatarType=issuetype",
-                                    "name": "Bug",
-                                    "subtask": False,
-                                    "avatarId": 18803
-                                },
-                                {
-                                    "self": "https://jira.corp.adobe.com/rest/api/2/issuetype/7",
-                                    "id": "7",
-                                    "description": "Created by Jira Software - do not edit or delete. Issue type for a user story.",
-                                    "iconUrl": "https://jira.corp.adobe.com/secure/viewavatar?size=xsmall&avatarId=18815&avatarType=issuetype",
-                                    "name": "Story",
-                                    "subtask": False,
-                                    "avatarId": 18815
-                                }
-                            ], indent=2),
+                            "text": _dumps_text([dict(_BUG_ISSUETYPE), dict(_STORY_ISSUETYPE)]),
                             "type": "text"
                         }
                     ],
@@ -338,8 +442,8 @@ def main():
     os.makedirs("tests/fixtures", exist_ok=True)
     
     filename = "tests/fixtures/jira_mock_data.json"
-    with open(filename, 'w') as f:
-        json.dump(mock_data, f, indent=2)
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(mock_data, option=JSON_OPTIONS))
     
     print(f"✅ Mock test data generated and saved to: {filename}")
     print(f"📊 Generated {len(mock_data['operations'])} operation responses")
@@ -352,8 +456,8 @@ def main():
         "search_result": generate_mock_search_result("DNA", 3)
     }
     
-    with open(simple_filename, 'w') as f:
-        json.dump(simple_data, f, indent=2)
+    with open(simple_filename, 'wb') as f:
+        f.write(orjson.dumps(simple_data, option=JSON_OPTIONS))
     
     print(f"📁 Also saved simple version as: {simple_filename}")
 